@@ -56,7 +56,11 @@ def upgrader(func: TUpgraderFunction) -> TUpgraderFunction:
     `ConnectionPlus`. The upgrade function must either perform the upgrade
     and return (no return values allowed) or fail to perform the upgrade,
     in which case it must raise a RuntimeError. A failed upgrade must be
-    completely rolled back before the RuntimeError is raises.
+    completely rolled back before the RuntimeError is raised. The only
+    exception is an upgrade that commits its work in several transactions
+    and can be resumed: it may leave the work of its committed transactions
+    in place, as long as performing the upgrade again completes it. The
+    database version is only set once the upgrade has succeeded.
 
     The decorator takes care of logging about the upgrade and managing the
     database versioning.
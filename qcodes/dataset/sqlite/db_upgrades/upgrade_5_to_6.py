@@ -1,15 +1,113 @@
 import json
+import sqlite3
 import sys
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from tqdm import tqdm
 
 from qcodes.dataset.descriptions.versioning.v0 import InterDependencies
 from qcodes.dataset.sqlite.connection import ConnectionPlus, atomic, \
-    atomic_transaction
-from qcodes.dataset.sqlite.queries import get_run_description, \
-    update_run_description
+    atomic_transaction, transaction
 from qcodes.dataset.sqlite.query_helpers import one
 
+# conditionally import orjson for faster (de)serialization of descriptions
+try:
+    import orjson
+    USE_ORJSON = True
+except ImportError:
+    USE_ORJSON = False
+
+
+# number of run descriptions that are transformed and written to the
+# database at a time
+_BATCH_SIZE = 1000
+
+# number of run descriptions that are upgraded per transaction by the python
+# fallback of the upgrade
+_TRANSACTION_SIZE = 10 * _BATCH_SIZE
+
+_Row = Tuple[int, Optional[bytes]]
+
+_SELECT_DESCRIPTIONS_SQL = """
+                           SELECT run_id, run_description
+                           FROM runs
+                           WHERE run_id > ?
+                           ORDER BY run_id
+                           LIMIT ?
+                           """
+
+# the descriptions are handled as UTF-8 encoded bytes, which must be cast to
+# be stored as TEXT rather than as BLOB
+_UPDATE_DESCRIPTION_SQL = """
+                          UPDATE runs
+                          SET run_description = CAST(? AS TEXT)
+                          WHERE run_id = ?
+                          """
+
+# with the JSON1 extension of SQLite, the descriptions can be rewritten
+# without ever loading them into python. Descriptions that already have a
+# 'version' entry are left alone
+_UPGRADE_DESCRIPTIONS_SQL = """
+                            UPDATE runs
+                            SET run_description = json_object(
+                                'version', 0,
+                                'interdependencies',
+                                json_extract(run_description,
+                                             '$.interdependencies'))
+                            WHERE run_description IS NOT NULL
+                            AND json_extract(run_description,
+                                             '$.version') IS NULL
+                            """
+
+# descriptions that can not be upgraded, since they lack the
+# 'interdependencies' entry. json_type, unlike json_extract, tells a missing
+# entry apart from an entry that holds a JSON null
+_MISSING_INTERDEPENDENCIES_SQL = """
+                                 SELECT run_id
+                                 FROM runs
+                                 WHERE run_description IS NOT NULL
+                                 AND json_extract(run_description,
+                                                  '$.version') IS NULL
+                                 AND json_type(run_description,
+                                               '$.interdependencies') IS NULL
+                                 LIMIT 1
+                                 """
+
+_UPGRADE_EMPTY_DESCRIPTIONS_SQL = """
+                                  UPDATE runs
+                                  SET run_description = CAST(? AS TEXT)
+                                  WHERE run_description IS NULL
+                                  """
+
+# settings that are applied to the connection for the duration of the
+# upgrade; the rewrite of the runs table is dominated by disk I/O once the
+# JSON handling is cheap. The journal mode is left as the user set it up,
+# e.g. DELETE for databases on network shares that do not support WAL
+_UPGRADE_PRAGMAS = {'cache_size': '-65536',
+                    'temp_store': 'MEMORY'}
+
+# settings that are only applied in WAL mode; with a rollback journal,
+# synchronous=NORMAL may corrupt the database on a power loss
+_WAL_UPGRADE_PRAGMAS = {'synchronous': 'NORMAL'}
+
+
+def _json_loads(json_bytes: bytes) -> Any:
+    if USE_ORJSON:
+        return orjson.loads(json_bytes)
+    return json.loads(json_bytes)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if USE_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+# the upgraded description of runs that have no description at all
+_DEFAULT_DESCRIPTION_JSON = _json_dumps(
+    {'version': 0, 'interdependencies': InterDependencies()._to_dict()})
+
 
 def upgrade_5_to_6(conn: ConnectionPlus) -> None:
     """
@@ -19,27 +117,157 @@ def upgrade_5_to_6(conn: ConnectionPlus) -> None:
     called 'version'. Note that version changes of the runs_description will
     not be tracked as schema upgrades.
     """
-    no_of_runs_query = "SELECT max(run_id) FROM runs"
-    no_of_runs = one(atomic_transaction(conn, no_of_runs_query), 'max(run_id)')
-    no_of_runs = no_of_runs or 0
+    with _tuned_pragmas(conn):
+        if _json1_available(conn):
+            _upgrade_5_to_6_in_sqlite(conn)
+        else:
+            _upgrade_5_to_6_in_python(conn)
+
 
-    # If one run fails, we want the whole upgrade to roll back, hence the
-    # entire upgrade is one atomic transaction
+@contextmanager
+def _tuned_pragmas(conn: ConnectionPlus) -> Iterator[None]:
+    """
+    Apply the pragmas in ``_UPGRADE_PRAGMAS``, and in WAL mode also those in
+    ``_WAL_UPGRADE_PRAGMAS``, to the connection and restore the original
+    values on exit. Must not be used inside a transaction since the
+    synchronous setting can not be changed there.
+    """
+    pragmas = dict(_UPGRADE_PRAGMAS)
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    if journal_mode.lower() == 'wal':
+        pragmas.update(_WAL_UPGRADE_PRAGMAS)
+
+    old_values: Dict[str, Any] = {}
+    for pragma, value in pragmas.items():
+        old_values[pragma] = conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+        conn.execute(f"PRAGMA {pragma}={value}")
+    try:
+        yield
+    finally:
+        for pragma, value in old_values.items():
+            conn.execute(f"PRAGMA {pragma}={value}")
+
+
+@contextmanager
+def _text_as_bytes(conn: ConnectionPlus) -> Iterator[None]:
+    """
+    Let the connection return TEXT values as UTF-8 encoded bytes instead of
+    decoding them to str, since the JSON parsers accept bytes directly
+    """
+    old_text_factory = conn.text_factory
+    conn.text_factory = bytes
+    try:
+        yield
+    finally:
+        conn.text_factory = old_text_factory
 
+
+def _json1_available(conn: ConnectionPlus) -> bool:
+    """
+    Return whether the JSON1 extension of SQLite is available on the given
+    connection
+    """
+    try:
+        conn.execute("SELECT json('{}')")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def _upgrade_5_to_6_in_sqlite(conn: ConnectionPlus) -> None:
+    """
+    Rewrite all run descriptions with SQL statements using the JSON1
+    extension of SQLite
+    """
     with atomic(conn) as conn:
-        pbar = tqdm(range(1, no_of_runs+1), file=sys.stdout)
+        pbar = tqdm(total=1, file=sys.stdout)
         pbar.set_description("Upgrading database; v5 -> v6")
 
-        empty_idps_ser = InterDependencies()._to_dict()
-
-        for run_id in pbar:
-            json_str = get_run_description(conn, run_id)
-            if json_str is None:
-                new_json = json.dumps({'version': 0,
-                                       'interdependencies': empty_idps_ser})
-            else:
-                ser = json.loads(json_str)
-                new_ser = {'version': 0}  # let 'version' be the first entry
-                new_ser['interdependencies'] = ser['interdependencies']
-                new_json = json.dumps(new_ser)
-            update_run_description(conn, run_id, new_json)
+        broken_run = transaction(
+            conn, _MISSING_INTERDEPENDENCIES_SQL).fetchone()
+        if broken_run is not None:
+            pbar.close()
+            raise RuntimeError(f'The run description of run '
+                               f'{broken_run[0]} has no '
+                               f'interdependencies and can not be '
+                               f'upgraded')
+        transaction(conn, _UPGRADE_DESCRIPTIONS_SQL)
+        transaction(conn, _UPGRADE_EMPTY_DESCRIPTIONS_SQL,
+                    _DEFAULT_DESCRIPTION_JSON)
+
+        pbar.update(1)
+        pbar.close()
+
+
+def _upgrade_5_to_6_in_python(conn: ConnectionPlus) -> None:
+    """
+    Rewrite all run descriptions one by one in python. This is the fallback
+    for SQLite builds without the JSON1 extension.
+
+    The runs are upgraded in separate transactions of ``_TRANSACTION_SIZE``
+    runs each, so that the write lock is released regularly and the WAL
+    can be checkpointed during the upgrade of a large database. If a
+    transaction fails, the runs of the previous transactions stay upgraded.
+    This is harmless, since upgraded descriptions are skipped when the
+    upgrade is performed again and the database version is only bumped once
+    all runs have been upgraded.
+    """
+    count_query = "SELECT COUNT(*) FROM runs"
+    no_of_runs = one(atomic_transaction(conn, count_query), 'COUNT(*)')
+
+    # the bar is advanced once per transaction, so there is no need
+    # for frequent refreshes or a smoothed rate estimate
+    pbar = tqdm(total=no_of_runs, file=sys.stdout, mininterval=0.5,
+                smoothing=0)
+    pbar.set_description("Upgrading database; v5 -> v6")
+
+    with _text_as_bytes(conn):
+        last_run_id = 0
+        while True:
+            with atomic(conn) as conn:
+                select_cursor = conn.cursor()
+                select_cursor.execute(_SELECT_DESCRIPTIONS_SQL,
+                                      (last_run_id, _TRANSACTION_SIZE))
+                rows = select_cursor.fetchall()
+                if not rows:
+                    break
+
+                for start in range(0, len(rows), _BATCH_SIZE):
+                    pending = _transform_descriptions(
+                        rows[start:start + _BATCH_SIZE])
+                    if pending:
+                        conn.cursor().executemany(_UPDATE_DESCRIPTION_SQL,
+                                                  pending)
+
+            last_run_id = rows[-1][0]
+            pbar.update(len(rows))
+
+    pbar.close()
+
+
+def _transform_descriptions(rows: Sequence[_Row]) -> List[Tuple[bytes, int]]:
+    """
+    Upgrade the given (run_id, run_description) rows
+
+    Returns:
+        The (new description, run_id) pairs of the rows that need to be
+        updated
+    """
+    pending: List[Tuple[bytes, int]] = []
+
+    for run_id, json_bytes in rows:
+        if json_bytes is None:
+            new_json = _DEFAULT_DESCRIPTION_JSON
+        elif json_bytes.startswith(b'{"version":'):
+            # the description has already been upgraded, e.g. by
+            # an earlier, interrupted upgrade. All writers of upgraded
+            # descriptions put the 'version' entry first
+            continue
+        else:
+            ser = _json_loads(json_bytes)
+            new_ser = {'version': 0}  # let 'version' be the first entry
+            new_ser['interdependencies'] = ser['interdependencies']
+            new_json = _json_dumps(new_ser)
+        pending.append((new_json, run_id))
+
+    return pending
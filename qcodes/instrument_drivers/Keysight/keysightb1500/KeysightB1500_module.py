@@ -33,22 +33,14 @@ def fmt_response_base_parser(raw_data_val: str) -> _FMTResponse:
     """
 
     values_separator = ','
-    data_val = []
-    data_status = []
-    data_channel = []
-    data_datatype = []
+    str_values = raw_data_val.split(values_separator)
+    channel_names = constants.ChannelName
 
-    for str_value in raw_data_val.split(values_separator):
-        status = str_value[0]
-        channel_id = constants.ChannelName[str_value[1]].value
-
-        datatype = str_value[2]
-        value = float(str_value[3:])
-
-        data_val.append(value)
-        data_status.append(status)
-        data_channel.append(channel_id)
-        data_datatype.append(datatype)
+    data_val = [float(str_value[3:]) for str_value in str_values]
+    data_status = [str_value[0] for str_value in str_values]
+    data_channel = [channel_names[str_value[1]].value
+                    for str_value in str_values]
+    data_datatype = [str_value[2] for str_value in str_values]
 
     data = _FMTResponse(data_val, data_status, data_channel, data_datatype)
     return data
@@ -94,7 +86,7 @@ def parse_dcv_measurement_response(response: str) -> Dict[str, Union[str,
         response: Response str to lrn_query For the MFCMU.
     """
 
-    match = re.match(_pattern_lrn, response)
+    match = _pattern_lrn.match(response)
     if match is None:
         raise ValueError(f"{response!r} didn't match {_pattern_lrn!r} pattern")
 
@@ -129,7 +121,7 @@ def parse_spot_measurement_response(response: str) -> SpotResponse:
         Dictionary with measured value and associated metadata (e.g.
         timestamp, channel number, etc.)
     """
-    match = re.match(_pattern, response)
+    match = _pattern.match(response)
     if match is None:
         raise ValueError(f"{response!r} didn't match {_pattern!r} pattern")
 
@@ -256,8 +248,8 @@ def convert_dummy_val_to_nan(param: _FMTResponse) -> None:
         param: This must be of type named tuple _FMTResponse.
 
     """
-    for index, value in enumerate(param.value):
-        param.value[index] = _convert_to_nan_if_dummy_value(param.value[index])
+    param.value[:] = [_convert_to_nan_if_dummy_value(value)
+                      for value in param.value]
 
 
 def _convert_to_nan_if_dummy_value(value: float) -> float:
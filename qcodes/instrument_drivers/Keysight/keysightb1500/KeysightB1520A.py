@@ -1,7 +1,12 @@
+import math
 import re
+import string
 import textwrap
+from functools import lru_cache
 import numpy as np
-from typing import Optional, TYPE_CHECKING, Tuple, Union, Dict, Any
+from typing import Optional, TYPE_CHECKING, Tuple, Union, Dict, Any, \
+    List, Sequence
+from typing_extensions import TypedDict
 
 from qcodes.instrument.parameter import MultiParameter
 from qcodes.instrument.group_parameter import GroupParameter, Group
@@ -13,21 +18,40 @@ from .KeysightB1500_module import B1500Module, parse_dcorr_query_response, \
     _FMTResponse, fmt_response_base_parser, fixed_negative_float, \
     get_name_label_unit_of_impedance_model, StatusMixin, \
     convert_dummy_val_to_nan
-from .message_builder import MessageBuilder
+from .message_builder import MessageBuilder, MAX_MESSAGE_LENGTH
 from . import constants
 from .constants import ModuleKind, ChNr, MM
 
 if TYPE_CHECKING:
     from .KeysightB1500_base import KeysightB1500
 
-_pattern = re.compile(r"((?P<status>\w)(?P<chnr>\w)(?P<dtype>\w))?"
-                      r"(?P<value>[+-]\d{1,3}\.\d{3,6}E[+-]\d{2})")
+# Pattern to match the commands of a ``LRN?`` response against, e.g.
+# 'WMDCV2,2;WTDCV1.0,0.0,0.0,0.0,0.0;WDCV3,1,0.0,1.0,5'
+_lrn_command_pattern = re.compile(r'(?P<command>[A-Z]+)(?P<args>[^;]*)')
+
+_adc_mode_pattern = re.compile(r'ACT(.+?),(.+?)$')
+
+
+def _parse_lrn_response(response: str) -> Dict[str, List[str]]:
+    """
+    Split the response of a ``LRN?`` query into its commands in a single
+    pass, and return a dictionary from command names to their arguments.
+    """
+    return {match['command']: match['args'].split(',')
+            for match in _lrn_command_pattern.finditer(response)}
+
+
+class _SweepAutoAbortSettings(TypedDict):
+    abort_function: str
+    output_after_sweep: Optional[str]
 
 
 class CVSweeper(InstrumentChannel):
     def __init__(self, parent: 'B1520A', name: str, **kwargs: Any):
         super().__init__(parent, name, **kwargs)
 
+        self._wmdcv_messages: Dict[Tuple[Any, Any], str] = {}
+
         self.add_parameter(name='sweep_auto_abort',
                            set_cmd=self._set_sweep_auto_abort,
                            get_cmd=self._get_sweep_auto_abort,
@@ -219,16 +243,16 @@ class CVSweeper(InstrumentChannel):
 
     @staticmethod
     def _get_sweep_delays_parser(response: str) -> Dict[str, float]:
-        match = re.search('WTDCV(?P<hold_time>.+?),(?P<delay>.+?),'
-                          '(?P<step_delay>.+?),(?P<trigger_delay>.+?),'
-                          '(?P<measure_delay>.+?)(;|$)',
-                          response)
-        if not match:
+        args = _parse_lrn_response(response).get('WTDCV')
+        if args is None:
             raise ValueError('Sweep delays (WTDCV) not found.')
 
-        out_str = match.groupdict()
-        out_dict = {key: float(value) for key, value in out_str.items()}
-        return out_dict
+        hold_time, delay, step_delay, trigger_delay, measure_delay = args
+        return {'hold_time': float(hold_time),
+                'delay': float(delay),
+                'step_delay': float(step_delay),
+                'trigger_delay': float(trigger_delay),
+                'measure_delay': float(measure_delay)}
 
     @staticmethod
     def _get_sweep_steps() -> str:
@@ -240,47 +264,51 @@ class CVSweeper(InstrumentChannel):
 
     @staticmethod
     def _get_sweep_steps_parser(response: str) -> Dict[str, Union[int, float]]:
-        match = re.search(r'WDCV(?P<_chan>.+?),(?P<sweep_mode>.+?),'
-                          r'(?P<sweep_start>.+?),(?P<sweep_end>.+?),'
-                          r'(?P<sweep_steps>.+?)(;|$)',
-                          response)
-        if not match:
+        args = _parse_lrn_response(response).get('WDCV')
+        if args is None:
             raise ValueError('Sweep steps (WDCV) not found.')
 
-        resp_dict = match.groupdict()
-
-        out_dict: Dict[str, Union[int, float]] = {}
-        out_dict['_chan'] = int(resp_dict['_chan'])
-        out_dict['sweep_mode'] = int(resp_dict['sweep_mode'])
-        out_dict['sweep_start'] = fixed_negative_float(
-            resp_dict['sweep_start'])
-        out_dict['sweep_end'] = fixed_negative_float(resp_dict['sweep_end'])
-        out_dict['sweep_steps'] = int(resp_dict['sweep_steps'])
-
-        return out_dict
+        chan, sweep_mode, sweep_start, sweep_end, sweep_steps = args
+        return {'_chan': int(chan),
+                'sweep_mode': int(sweep_mode),
+                'sweep_start': fixed_negative_float(sweep_start),
+                'sweep_end': fixed_negative_float(sweep_end),
+                'sweep_steps': int(sweep_steps)}
 
     def _set_sweep_auto_abort(self, val: Union[bool, constants.Abort]) -> None:
-        msg = MessageBuilder().wmdcv(abort=val)
-        self.write(msg.message)
+        self.write(self._wmdcv_message(abort=val))
 
     def _set_post_sweep_voltage_condition(
             self, val: Union[constants.WMDCV.Post, int]) -> None:
-        msg = MessageBuilder().wmdcv(abort=self.sweep_auto_abort(), post=val)
-        self.write(msg.message)
+        self.write(self._wmdcv_message(abort=self.sweep_auto_abort(),
+                                       post=val))
 
-    def _get_sweep_auto_abort_settings(self) -> Dict[str, str]:
+    def _wmdcv_message(
+            self,
+            abort: Union[bool, constants.Abort],
+            post: Optional[Union[constants.WMDCV.Post, int]] = None
+    ) -> str:
+        # The parsers of ``sweep_auto_abort`` always pass a
+        # ``constants.Abort`` here, so ``True`` can not collide with the
+        # equal ``constants.Abort.DISABLED`` key
+        key = (abort, post)
+        msg = self._wmdcv_messages.get(key)
+        if msg is None:
+            msg = MessageBuilder().wmdcv(abort=abort, post=post).message
+            self._wmdcv_messages[key] = msg
+        return msg
+
+    def _get_sweep_auto_abort_settings(self) -> _SweepAutoAbortSettings:
         msg = MessageBuilder().lrn_query(
             type_id=constants.LRN.Type.CV_DC_BIAS_SWEEP_MEASUREMENT_SETTINGS
         )
         response = self.ask(msg.message)
-        match = re.search(r'WMDCV(?P<abort_function>.+?)'
-                          r'(,(?P<output_after_sweep>.+?)|;)',
-                          response)
-        if match is None:
+        args = _parse_lrn_response(response).get('WMDCV')
+        if args is None:
             raise RuntimeError("Did not find expected response for sweep "
                                "auto abort settings")
-        resp_dict = match.groupdict()
-        return resp_dict
+        return {'abort_function': args[0],
+                'output_after_sweep': args[1] if len(args) > 1 else None}
 
     def _get_sweep_auto_abort(self) -> int:
         resp_dict = self._get_sweep_auto_abort_settings()
@@ -294,6 +322,79 @@ class CVSweeper(InstrumentChannel):
         return int(resp_dict['output_after_sweep'])
 
 
+def _linear_sweep(start: float, end: float, steps: int) -> np.ndarray:
+    return np.linspace(start, end, steps)
+
+
+def _logspace(start: float, end: float, steps: int, endpoint: bool = True
+              ) -> np.ndarray:
+    # start and end have the same polarity, negative sweeps are mirrored
+    sign = -1 if start < 0 else 1
+    return sign * np.logspace(math.log10(sign * start),
+                              math.log10(sign * end),
+                              steps, endpoint=endpoint)
+
+
+def _log_sweep(start: float, end: float, steps: int) -> np.ndarray:
+    return _logspace(start, end, steps)
+
+
+def _linear_2way_sweep(start: float, end: float, steps: int
+                       ) -> np.ndarray:
+    if steps % 2 == 0:
+        half = np.linspace(start, end, steps // 2)
+        sweep_val = np.concatenate((half, half[::-1]))
+    else:
+        half = np.linspace(start, end, steps // 2, endpoint=False)
+        sweep_val = np.concatenate((half, [end], half[::-1]))
+    return sweep_val
+
+
+def _log_2way_sweep(start: float, end: float, steps: int
+                    ) -> np.ndarray:
+    if steps % 2 == 0:
+        half = _logspace(start, end, steps // 2)
+        sweep_val = np.concatenate((half, half[::-1]))
+    else:
+        half = _logspace(start, end, steps // 2, endpoint=False)
+        sweep_val = np.concatenate((half, [end], half[::-1]))
+    return sweep_val
+
+
+_sweep_modes = {1: _linear_sweep,
+                2: _log_sweep,
+                3: _linear_2way_sweep,
+                4: _log_2way_sweep}
+
+
+@lru_cache(maxsize=32)
+def _get_cv_sweep_voltages(mode: int, start: float, end: float, steps: int
+                           ) -> Tuple[float, ...]:
+    """
+    Compute the voltages of a CV sweep. The result only depends on the
+    arguments, hence it is cached.
+    """
+    if start == end:
+        return (float(start),) * steps
+    if mode in (2, 4):
+        sign_start = (start > 0) - (start < 0)
+        sign_end = (end > 0) - (end < 0)
+        if sign_start != sign_end:
+            if sign_start == 0:
+                start = sign_end * 0.005  # resolution
+            elif sign_end == 0:
+                end = sign_start * 0.005  # resolution
+            else:
+                raise AssertionError("Polarity of start and end is not "
+                                     "same.")
+
+    if steps == 1 and mode in (1, 2):
+        # a single stair sweep of one step only contains the start value
+        return (float(start),)
+
+    return tuple(_sweep_modes[mode](start, end, steps).tolist())
+
+
 class B1520A(B1500Module):
     """
     Driver for Keysight B1520A Capacitance Measurement Unit module for B1500
@@ -314,6 +415,11 @@ class B1520A(B1500Module):
         super().__init__(parent, name, slot_nr, **kwargs)
 
         self.channels = (ChNr(slot_nr),)
+        # Prefixes of the single channel commands that are sent the most
+        # during a sweep setup, see ``_set_voltage_dc`` and friends
+        self._dcv_prefix = f'DCV {self.channels[0]},'
+        self._acv_prefix = f'ACV {self.channels[0]},'
+        self._fc_prefix = f'FC {self.channels[0]},'
         self.setup_fnc_already_run = False
         self._ranging_mode: constants.RangingMode = constants.RangingMode.AUTO
         self._measurement_range_for_non_auto: Optional[int] = None
@@ -494,70 +600,23 @@ class B1520A(B1500Module):
                            """))
 
     def _cv_sweep_voltages(self) -> Tuple[float, ...]:
-        sign = lambda s: s and (1, -1)[s < 0]
-        start_value = self.cv_sweep.sweep_start()
-        end_value = self.cv_sweep.sweep_end()
-        step_value = self.cv_sweep.sweep_steps()
-        mode = self.cv_sweep.sweep_mode()
-        if mode in (2, 4):
-            if not sign(start_value) == sign(end_value):
-                if sign(start_value) == 0:
-                    start_value = sign(start_value) * 0.005  # resolution
-                elif sign(end_value) == 0:
-                    end_value = sign(end_value) * 0.005  # resolution
-                else:
-                    raise AssertionError("Polarity of start and end is not "
-                                         "same.")
-
-        def linear_sweep(start: float, end: float, steps: int
-                         ) -> Tuple[float, ...]:
-            sweep_val = np.linspace(start, end, steps)
-            return tuple(sweep_val)
-
-        def log_sweep(start: float, end: float, steps: int
-                      ) -> Tuple[float, ...]:
-            sweep_val = np.logspace(np.log10(start), np.log10(end), steps)
-            return tuple(sweep_val)
-
-        def linear_2way_sweep(start: float, end: float, steps: int
-                              ) -> Tuple[float, ...]:
-            if steps % 2 == 0:
-                half_list = list(np.linspace(start, end, steps // 2))
-                sweep_val = half_list + half_list[::-1]
-            else:
-                half_list = list(np.linspace(start, end, steps // 2,
-                                             endpoint=False))
-                sweep_val = half_list + [end] + half_list[::-1]
-            return tuple(sweep_val)
-
-        def log_2way_sweep(start: float, end: float, steps: int
-                           ) -> Tuple[float, ...]:
-            if steps % 2 == 0:
-                half_list = list(np.logspace(np.log10(start), np.log10(end),
-                                             steps // 2))
-                sweep_val = half_list + half_list[::-1]
-            else:
-                half_list = list(np.logspace(np.log10(start), np.log10(end),
-                                             steps // 2, endpoint=False))
-                sweep_val = half_list + [end] + half_list[::-1]
-            return tuple(sweep_val)
-
-        modes = {1: linear_sweep,
-                 2: log_sweep,
-                 3: linear_2way_sweep,
-                 4: log_2way_sweep}
-
-        return modes[mode](start_value, end_value, step_value)
+        # All sweep parameters are read back by the same ``WDCV`` query, so
+        # update the group once and read the values from the caches
+        self.cv_sweep._set_sweep_steps_group.update()
+        return self._cv_sweep_voltages_from_cache()
+
+    def _cv_sweep_voltages_from_cache(self) -> Tuple[float, ...]:
+        cv_sweep = self.cv_sweep
+        return _get_cv_sweep_voltages(cv_sweep.sweep_mode.cache.get(),
+                                      cv_sweep.sweep_start.cache.get(),
+                                      cv_sweep.sweep_end.cache.get(),
+                                      cv_sweep.sweep_steps.cache.get())
 
     def _set_voltage_dc(self, value: float) -> None:
-        msg = MessageBuilder().dcv(self.channels[0], value)
-
-        self.write(msg.message)
+        self.write(f'{self._dcv_prefix}{value}')
 
     def _set_voltage_ac(self, value: float) -> None:
-        msg = MessageBuilder().acv(self.channels[0], value)
-
-        self.write(msg.message)
+        self.write(f'{self._acv_prefix}{value}')
 
     def _get_dcv(self) -> Dict[str, Union[str, float]]:
         if not self.is_enabled():
@@ -581,9 +640,7 @@ class B1520A(B1500Module):
         return float(dcv['frequency'])
 
     def _set_frequency(self, value: float) -> None:
-        msg = MessageBuilder().fc(self.channels[0], value)
-
-        self.write(msg.message)
+        self.write(f'{self._fc_prefix}{value}')
 
     def _get_capacitance(self) -> Tuple[float, float]:
         msg = MessageBuilder().tc(
@@ -592,18 +649,18 @@ class B1520A(B1500Module):
 
         response = self.ask(msg.message)
 
-        parsed = [item for item in re.finditer(_pattern, response)]
+        parsed = response.split(',')
 
-        if (
-                len(parsed) not in (2, 4)
-        ):
+        if len(parsed) not in (2, 4):
             raise ValueError("Result format not supported.")
 
-        return float(parsed[0]["value"]), float(parsed[1]["value"])
+        # The status/channel/type header of the values is only present in
+        # some of the output formats, e.g. ``FMT 1`` but not ``FMT 2``
+        return (float(parsed[0].lstrip(string.ascii_letters)),
+                float(parsed[1].lstrip(string.ascii_letters)))
 
     def _set_phase_compensation_mode(self, mode: constants.ADJ.Mode) -> None:
-        msg = MessageBuilder().adj(chnum=self.channels[0], mode=mode)
-        self.write(msg.message)
+        self.write(f'ADJ {self.channels[0]},{mode}')
 
     def phase_compensation(
             self,
@@ -653,13 +710,12 @@ class B1520A(B1500Module):
 
     @staticmethod
     def _get_adc_mode_parser(response: str) -> Dict[str, int]:
-        match = re.search(r'ACT(?P<adc_mode>.+?),(?P<adc_coef>.+?)$', response)
+        match = _adc_mode_pattern.search(response)
         if not match:
             raise ValueError('ADC mode and coef (ATC) not found.')
 
-        out_str = match.groupdict()
-        out_dict = {key: int(value) for key, value in out_str.items()}
-        return out_dict
+        adc_mode, adc_coef = match.group(1, 2)
+        return {'adc_mode': int(adc_mode), 'adc_coef': int(adc_coef)}
 
     def abort(self) -> None:
         """
@@ -676,15 +732,13 @@ class B1520A(B1500Module):
 
     def _set_impedance_model(self, val: Union[constants.IMP.MeasurementMode,
                                               int]) -> None:
-        msg = MessageBuilder().imp(mode=val)
-        self.write(msg.message)
+        self.write(f'IMP {val}')
         if hasattr(self, 'run_sweep'):
             self.run_sweep.update_name_label_unit_from_impedance_model(
                 model=val)
 
     def _set_ac_dc_volt_monitor(self, val: bool) -> None:
-        msg = MessageBuilder().lmn(enable_data_monitor=val)
-        self.write(msg.message)
+        self.write(f'LMN {int(val)}')
 
     def _set_ranging_mode(self, val: Union[constants.RangingMode, int]) -> None:
         self._ranging_mode = constants.RangingMode(val)
@@ -810,18 +864,21 @@ class B1520A(B1500Module):
         self.adc_coef(adc_coef)
         self.frequency(freq)
         self.voltage_ac(ac_rms)
-        self.cv_sweep.sweep_auto_abort(abort_enabled)
-        self.cv_sweep.post_sweep_voltage_condition(
+
+        cv_sweep = self.cv_sweep
+        cv_sweep.sweep_auto_abort(abort_enabled)
+        cv_sweep.post_sweep_voltage_condition(
             post_sweep_voltage_condition)
-        self.cv_sweep.hold_time(hold_delay)
-        self.cv_sweep.delay(delay)
-        self.cv_sweep.step_delay(step_delay)
-        self.cv_sweep.trigger_delay(trigger_delay)
-        self.cv_sweep.measure_delay(measure_delay)
-        self.cv_sweep.sweep_mode(sweep_mode)
-        self.cv_sweep.sweep_start(v_start)
-        self.cv_sweep.sweep_end(v_end)
-        self.cv_sweep.sweep_steps(n_steps)
+        cv_sweep.hold_time(hold_delay)
+        cv_sweep.delay(delay)
+        cv_sweep.step_delay(step_delay)
+        cv_sweep.trigger_delay(trigger_delay)
+        cv_sweep.measure_delay(measure_delay)
+        cv_sweep.sweep_mode(sweep_mode)
+        cv_sweep.sweep_start(v_start)
+        cv_sweep.sweep_end(v_end)
+        cv_sweep.sweep_steps(n_steps)
+
         self.measurement_mode(constants.MM.Mode.CV_DC_SWEEP)
         self.impedance_model(imp_model)
         self.ac_dc_volt_monitor(volt_monitor)
@@ -873,14 +930,23 @@ class CVSweepMeasurement(MultiParameter, StatusMixin):
         self.power_line_frequency: int = 50
         self._fudge: float = 1.5 # fudge factor for setting timeout
 
+        self._xe_message = MessageBuilder().xe().message
+        # Number of steps and voltages that ``shapes`` and ``setpoints``
+        # were last built from, if they do not come from the measured data
+        self._sweep_signature: Optional[Tuple[int, Tuple[float, ...]]] = None
+
     def get_raw(self) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
         if not self.instrument.setup_fnc_already_run:
             raise Exception('Sweep setup has not yet been run successfully')
 
-        delay_time = self.instrument.cv_sweep.step_delay()
+        # The sweep setup is written by ``setup_staircase_cv``, and the
+        # group parameters keep their caches in sync when set, so there is
+        # no need to query the instrument for it before every measurement
+        cv_sweep = self.instrument.cv_sweep
+        delay_time = cv_sweep.step_delay.cache.get()
 
-        nplc = self.instrument.adc_coef()
-        num_steps = self.instrument.cv_sweep.sweep_steps()
+        nplc = self.instrument.adc_coef.cache.get()
+        num_steps = cv_sweep.sweep_steps.cache.get()
         power_line_time_period = 1/self.power_line_frequency
         calculated_time = 2 * nplc * power_line_time_period * num_steps
 
@@ -888,29 +954,34 @@ class CVSweepMeasurement(MultiParameter, StatusMixin):
         new_timeout = estimated_timeout * self._fudge
 
         with self.root_instrument.timeout.set_to(new_timeout):
-            raw_data = self.instrument.ask(MessageBuilder().xe().message)
+            raw_data = self.instrument.ask(self._xe_message)
             parsed_data = fmt_response_base_parser(raw_data)
 
         if len(set(parsed_data.type)) == 2:
             self.param1 = _FMTResponse(
-                *[parsed_data[i][::2] for i in range(0, 4)])
+                *(field[::2] for field in parsed_data))
             self.param2 = _FMTResponse(
-                *[parsed_data[i][1::2] for i in range(0, 4)])
-
-            self.shapes = ((num_steps,),) * 2
-            self.setpoints = ((self.instrument.cv_sweep_voltages(),),) * 2
+                *(field[1::2] for field in parsed_data))
+
+            voltages = self.instrument._cv_sweep_voltages_from_cache()
+            sweep_signature = (num_steps, voltages)
+            if sweep_signature != self._sweep_signature:
+                self.shapes = ((num_steps,),) * 2
+                self.setpoints = ((voltages,),) * 2
+                self._sweep_signature = sweep_signature
         else:
             self.param1 = _FMTResponse(
-                *[parsed_data[i][::4] for i in range(0, 4)])
+                *(field[::4] for field in parsed_data))
             self.param2 = _FMTResponse(
-                *[parsed_data[i][1::4] for i in range(0, 4)])
+                *(field[1::4] for field in parsed_data))
             self.ac_voltage = _FMTResponse(
-                *[parsed_data[i][2::4] for i in range(0, 4)])
+                *(field[2::4] for field in parsed_data))
             self.dc_voltage = _FMTResponse(
-                *[parsed_data[i][3::4] for i in range(0, 4)])
+                *(field[3::4] for field in parsed_data))
 
             self.shapes = ((len(self.dc_voltage.value),),) * 2
             self.setpoints = ((self.dc_voltage.value,),) * 2
+            self._sweep_signature = None
 
         convert_dummy_val_to_nan(self.param1)
         convert_dummy_val_to_nan(self.param2)
@@ -930,6 +1001,13 @@ class CVSweepMeasurement(MultiParameter, StatusMixin):
 
 
 
+# Lookup tables from the integer responses of the ``CORRST?`` and ``CORR?``
+# queries to the respective enum members
+_corrst_responses = {member.value: member
+                     for member in constants.CORRST.Response}
+_corr_responses = {member.value: member for member in constants.CORR.Response}
+
+
 class Correction(InstrumentChannel):
     """
     A Keysight B1520A CMU submodule for performing open/short/load corrections.
@@ -982,7 +1060,10 @@ class Correction(InstrumentChannel):
         msg = MessageBuilder().corrst_query(chnum=self._chnum, corr=corr)
 
         response = self.ask(msg.message)
-        return constants.CORRST.Response(int(response))
+        status = _corrst_responses.get(int(response))
+        if status is None:
+            raise ValueError(f'{response} is not a valid CORRST? response')
+        return status
 
     def set_reference_values(self,
                              corr: constants.CalibrationType,
@@ -1071,7 +1152,10 @@ class Correction(InstrumentChannel):
             corr=corr
         )
         response = self.ask(msg.message)
-        return constants.CORR.Response(int(response))
+        status = _corr_responses.get(int(response))
+        if status is None:
+            raise ValueError(f'{response} is not a valid CORR? response')
+        return status
 
     def perform_and_enable(self, corr: constants.CalibrationType) -> str:
         """
@@ -1127,8 +1211,30 @@ class FrequencyList(InstrumentChannel):
         The frequency value can be given with a certain resolution as per
         Table 4-18 in the programming manual (year 2016).
         """
-        msg = MessageBuilder().corrl(chnum=self._chnum, freq=freq)
-        self.write(msg.message)
+        self.add_many([freq])
+
+    def add_many(self, freqs: Sequence[float]) -> None:
+        """
+        Append several MFCMU output frequencies for data correction in the
+        list, see :meth:`add`.
+
+        The ``CORRL`` commands are joined into as few messages as the input
+        buffer of the instrument allows, which saves a round-trip to the
+        instrument per frequency.
+        """
+        commands = [MessageBuilder().corrl(chnum=self._chnum,
+                                           freq=freq).message
+                    for freq in freqs]
+
+        msg = ''
+        for cmd in commands:
+            if msg and len(msg) + 1 + len(cmd) > MAX_MESSAGE_LENGTH:
+                self.write(msg)
+                msg = cmd
+            else:
+                msg = f'{msg};{cmd}' if msg else cmd
+        if msg:
+            self.write(msg)
 
     def query(self, index: Optional[int] = None) -> float:
         """
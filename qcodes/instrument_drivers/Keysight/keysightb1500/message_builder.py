@@ -12,6 +12,11 @@ def as_csv(l: Iterable[Any], sep: str = ',') -> str:
     return sep.join(format(x) for x in l)
 
 
+# Longest message that fits into the input buffer of the instrument
+# together with the termination characters
+MAX_MESSAGE_LENGTH = 250
+
+
 MessageBuilderMethodT = TypeVar('MessageBuilderMethodT',
                                 bound=Callable[..., 'MessageBuilder'])
 
@@ -28,6 +33,8 @@ def final_command(f: MessageBuilderMethodT) -> MessageBuilderMethodT:
 
 
 class CommandList(List[Any]):
+    __slots__ = ('is_final',)
+
     def __init__(self) -> None:
         super().__init__()
         self.is_final = False
@@ -61,13 +68,15 @@ class MessageBuilder:
     constants that the commands expect as arguments.
     """
 
+    __slots__ = ('_msg',)
+
     def __init__(self) -> None:
         self._msg = CommandList()
 
     @property
     def message(self) -> str:
         joined = str(self._msg)
-        if len(joined) > 250:
+        if len(joined) > MAX_MESSAGE_LENGTH:
             raise Exception(
                 f"Command is too long ({len(joined)}>256-termchars) "
                 f"and will overflow input buffer of instrument. "
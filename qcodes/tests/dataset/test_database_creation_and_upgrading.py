@@ -8,18 +8,20 @@ import pytest
 
 import qcodes as qc
 import qcodes.dataset.descriptions.versioning.serialization as serial
+import qcodes.dataset.sqlite.db_upgrades.upgrade_5_to_6 as upgrade_5_to_6
 import qcodes.tests.dataset
 from qcodes import new_data_set, new_experiment
 from qcodes.dataset.data_set import (load_by_counter, load_by_id,
                                      load_by_run_spec)
 from qcodes.dataset.descriptions.dependencies import InterDependencies_
-from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+from qcodes.dataset.descriptions.param_spec import ParamSpec, ParamSpecBase
 from qcodes.dataset.descriptions.versioning.v0 import InterDependencies
 from qcodes.dataset.guids import parse_guid
-from qcodes.dataset.sqlite.connection import ConnectionPlus, atomic_transaction
+from qcodes.dataset.sqlite.connection import (ConnectionPlus, atomic,
+                                              atomic_transaction)
 from qcodes.dataset.sqlite.database import (
     connect, get_db_version_and_newest_available_version, initialise_database,
-    initialise_or_create_database_at)
+    initialise_or_create_database_at, set_journal_mode)
 # pylint: disable=unused-import
 from qcodes.dataset.sqlite.db_upgrades import (_latest_available_version,
                                                get_user_version,
@@ -656,7 +658,19 @@ def test_perform_actual_upgrade_4_to_5(db_file):
         assert is_column_in_table(conn, 'runs', 'snapshot')
 
 
-def test_perform_actual_upgrade_5_to_6():
+@pytest.fixture(params=['sqlite', 'python'])
+def upgrade_5_to_6_path(request, monkeypatch):
+    """
+    Run a test with the JSON1 path of the 5 -> 6 upgrade and with its
+    python fallback
+    """
+    if request.param == 'python':
+        monkeypatch.setattr(upgrade_5_to_6, '_json1_available',
+                            lambda conn: False)
+    return request.param
+
+
+def test_perform_actual_upgrade_5_to_6(upgrade_5_to_6_path):
     fixpath = os.path.join(fixturepath, 'db_files', 'version5')
 
     db_file = 'empty.db'
@@ -693,6 +707,142 @@ def test_perform_actual_upgrade_5_to_6():
             assert desc._version == 3
 
 
+def test_perform_upgrade_5_to_6_with_non_contiguous_run_ids(
+        upgrade_5_to_6_path):
+    conn = connect(':memory:', version=5)
+
+    x = ParamSpec('x', 'numeric')
+    y = ParamSpec('y', 'numeric', depends_on=[x])
+    old_desc = json.dumps(
+        {'interdependencies': InterDependencies(x, y)._to_dict()})
+    # e.g. left behind by an earlier, interrupted upgrade
+    upgraded_desc = json.dumps(
+        {'version': 0,
+         'interdependencies': InterDependencies(x, y)._to_dict()})
+
+    # run 4 has no description, run 7 is already upgraded, runs 2 and 5
+    # have been deleted
+    for run_id, desc in ((1, old_desc), (3, old_desc), (4, None),
+                         (6, old_desc), (7, upgraded_desc)):
+        atomic_transaction(conn,
+                           "INSERT INTO runs (run_id, run_description) "
+                           "VALUES (?, ?)", run_id, desc)
+
+    perform_db_upgrade_5_to_6(conn)
+    assert get_user_version(conn) == 6
+    assert conn.text_factory is str
+
+    # the descriptions must be stored as TEXT, not as BLOB
+    types_query = "SELECT DISTINCT typeof(run_description) FROM runs"
+    types = atomic_transaction(conn, types_query).fetchall()
+    assert [tuple(row) for row in types] == [('text',)]
+
+    assert get_run_description(conn, 7) == upgraded_desc
+
+    for run_id in (1, 3, 6):
+        json_str = get_run_description(conn, run_id)
+        assert json.loads(json_str)['version'] == 0
+        desc = serial.from_json_to_current(json_str)
+        assert desc._version == 3
+        assert {ps.name for ps in desc.interdeps.paramspecs} == {'x', 'y'}
+
+    json_str = get_run_description(conn, 4)
+    assert json.loads(json_str) == {
+        'version': 0, 'interdependencies': {'paramspecs': []}}
+
+
+def test_perform_upgrade_5_to_6_with_many_runs(upgrade_5_to_6_path):
+    conn = connect(':memory:', version=5)
+
+    old_desc = json.dumps(
+        {'interdependencies': InterDependencies()._to_dict()})
+    # more runs than fit into one transaction of the python path, with
+    # gaps in the run_ids
+    run_ids = range(1, 5 * upgrade_5_to_6._TRANSACTION_SIZE // 2, 2)
+
+    with atomic(conn) as conn:
+        conn.cursor().executemany(
+            "INSERT INTO runs (run_id, run_description) VALUES (?, ?)",
+            ((run_id, old_desc) for run_id in run_ids))
+
+    perform_db_upgrade_5_to_6(conn)
+    assert get_user_version(conn) == 6
+
+    upgraded_query = ("SELECT COUNT(*) FROM runs "
+                      "WHERE run_description LIKE '{\"version\":%'")
+    assert one(atomic_transaction(conn, upgraded_query),
+               'COUNT(*)') == len(run_ids)
+
+    for run_id in (run_ids[0], run_ids[len(run_ids) // 2], run_ids[-1]):
+        json_str = get_run_description(conn, run_id)
+        assert json.loads(json_str) == {
+            'version': 0, 'interdependencies': {'paramspecs': []}}
+
+
+def test_perform_upgrade_5_to_6_resumes_after_failure(upgrade_5_to_6_path):
+    conn = connect(':memory:', version=5)
+
+    old_desc = json.dumps(
+        {'interdependencies': InterDependencies()._to_dict()})
+    no_of_runs = upgrade_5_to_6._TRANSACTION_SIZE + 10
+    broken_run_id = no_of_runs - 5
+
+    with atomic(conn) as conn:
+        conn.cursor().executemany(
+            "INSERT INTO runs (run_id, run_description) VALUES (?, ?)",
+            ((run_id, old_desc) for run_id in range(1, no_of_runs + 1)))
+        conn.cursor().execute(
+            "UPDATE runs SET run_description = ? WHERE run_id = ?",
+            (json.dumps({'nope': 1}), broken_run_id))
+
+    upgraded_query = ("SELECT COUNT(*) FROM runs "
+                      "WHERE run_description LIKE '{\"version\":%'")
+
+    with pytest.raises(RuntimeError):
+        perform_db_upgrade_5_to_6(conn)
+    assert get_user_version(conn) == 5
+
+    # the JSON1 path is a single transaction, while the python path keeps
+    # the transactions that were committed before the failure
+    no_of_upgraded = one(atomic_transaction(conn, upgraded_query),
+                         'COUNT(*)')
+    if upgrade_5_to_6_path == 'sqlite':
+        assert no_of_upgraded == 0
+    else:
+        assert no_of_upgraded == upgrade_5_to_6._TRANSACTION_SIZE
+
+    atomic_transaction(conn,
+                       "UPDATE runs SET run_description = ? "
+                       "WHERE run_id = ?", old_desc, broken_run_id)
+
+    perform_db_upgrade_5_to_6(conn)
+    assert get_user_version(conn) == 6
+    assert one(atomic_transaction(conn, upgraded_query),
+               'COUNT(*)') == no_of_runs
+
+    for run_id in (1, broken_run_id, no_of_runs):
+        json_str = get_run_description(conn, run_id)
+        assert json.loads(json_str) == {
+            'version': 0, 'interdependencies': {'paramspecs': []}}
+
+
+@pytest.mark.parametrize('journal_mode, synchronous', [('DELETE', 2),
+                                                       ('WAL', 1)])
+def test_upgrade_5_to_6_relaxes_synchronous_only_in_wal_mode(
+        tmp_path, journal_mode, synchronous):
+    conn = connect(str(tmp_path / 'test.db'), version=5)
+    set_journal_mode(conn, journal_mode)
+    conn.execute("PRAGMA synchronous=FULL")
+
+    def synchronous_setting():
+        return conn.execute("PRAGMA synchronous").fetchone()[0]
+
+    with upgrade_5_to_6._tuned_pragmas(conn):
+        assert synchronous_setting() == synchronous
+
+    assert synchronous_setting() == 2
+
+
 def test_perform_upgrade_6_7():
     fixpath = os.path.join(fixturepath, 'db_files', 'version6')
 
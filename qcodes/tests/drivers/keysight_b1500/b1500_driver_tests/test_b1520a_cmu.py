@@ -6,6 +6,8 @@ import pytest
 from qcodes.instrument_drivers.Keysight.keysightb1500 import constants
 from qcodes.instrument_drivers.Keysight.keysightb1500.KeysightB1520A import \
     B1520A
+from qcodes.instrument_drivers.Keysight.keysightb1500.message_builder import \
+    MAX_MESSAGE_LENGTH
 
 
 # pylint: disable=redefined-outer-name
@@ -113,6 +115,11 @@ def test_get_capacitance(cmu):
 
     assert pytest.approx((-1.55713E-06, -3.15845E-03)) == cmu.capacitance()
 
+    # output formats without the status/channel/type header
+    mainframe.ask.return_value = "-1.45713E-06,-3.05845E-03"
+
+    assert pytest.approx((-1.45713E-06, -3.05845E-03)) == cmu.capacitance()
+
 
 def test_raise_error_on_unsupported_result_format(cmu):
     mainframe = cmu.parent
@@ -212,14 +219,25 @@ def test_cv_sweep_voltages(cmu):
                                        voltages)])
 
 
-def test_sweep_modes(cmu):
+@pytest.mark.parametrize('mode, start, end, steps, expected', [
+    (constants.SweepMode.LINEAR_TWO_WAY, -1.0, 1.0, 5,
+     (-1.0, 0.0, 1.0, 0.0, -1.0)),
+    # a 0 V end point of a log sweep is replaced by the resolution of
+    # 5 mV with the polarity of the other end point
+    (constants.SweepMode.LOG, 0.0, 1.0, 3,
+     (0.005, np.sqrt(0.005), 1.0)),
+    (constants.SweepMode.LOG, -1.0, 0.0, 3,
+     (-1.0, -np.sqrt(0.005), -0.005)),
+    # log sweeps of negative voltages are mirrored
+    (constants.SweepMode.LOG, -0.1, -10.0, 3,
+     (-0.1, -1.0, -10.0)),
+    (constants.SweepMode.LOG_TWO_WAY, -0.1, -10.0, 5,
+     (-0.1, -1.0, -10.0, -1.0, -0.1)),
+])
+def test_sweep_modes(cmu, mode, start, end, steps, expected):
 
     mainframe = cmu.root_instrument
 
-    start = -1.0
-    end = 1.0
-    steps = 5
-    mode = constants.SweepMode.LINEAR_TWO_WAY
     return_string = f'WDCV3,{mode},{start},{end},{steps}'
     mainframe.ask.return_value = return_string
 
@@ -229,7 +247,18 @@ def test_sweep_modes(cmu):
     cmu.cv_sweep.sweep_mode(mode)
     voltages = cmu.cv_sweep_voltages()
 
-    assert all([a == b for a, b in zip((-1.0, 0.0, 1.0, 0.0, -1.0), voltages)])
+    assert pytest.approx(expected) == voltages
+
+
+def test_log_sweep_with_mixed_polarity_raises(cmu):
+    mainframe = cmu.root_instrument
+
+    mode = constants.SweepMode.LOG
+    mainframe.ask.return_value = f'WDCV3,{mode},-1.0,5.0,1'
+
+    with pytest.raises(AssertionError,
+                       match="Polarity of start and end is not same."):
+        cmu.cv_sweep_voltages()
 
 
 def test_run_sweep(cmu):
@@ -262,6 +291,91 @@ def test_run_sweep(cmu):
     assert cmu.run_sweep.units == ('S', 'ohms')
 
 
+def test_run_sweep_only_queries_measurement_data(cmu):
+    mainframe = cmu.parent
+
+    cmu.setup_fnc_already_run = True
+    cmu.cv_sweep.sweep_start(-1.0)
+    cmu.cv_sweep.sweep_end(1.0)
+    cmu.cv_sweep.sweep_steps(3)
+    mainframe.reset_mock()
+
+    mainframe.ask.return_value = ','.join(
+        ['NCC+1.00000E-12', 'NCD+2.00000E-03'] * 3)
+
+    cmu.run_sweep()
+    cmu.run_sweep()
+
+    # the sweep settings are taken from the parameter caches instead of
+    # being queried with LRN? before every measurement
+    assert mainframe.ask.call_args_list == [call('XE'), call('XE')]
+
+
+def test_run_sweep_updates_setpoints_when_sweep_changes(cmu):
+    mainframe = cmu.parent
+
+    cmu.setup_fnc_already_run = True
+    cmu.cv_sweep.sweep_start(-1.0)
+    cmu.cv_sweep.sweep_end(1.0)
+    cmu.cv_sweep.sweep_steps(3)
+
+    mainframe.ask.return_value = ','.join(
+        ['NCC+1.00000E-12', 'NCD+2.00000E-03'] * 3)
+
+    cmu.run_sweep()
+    assert cmu.run_sweep.shapes == ((3,),) * 2
+    assert pytest.approx([-1.0, 0.0, 1.0]) == \
+        list(cmu.run_sweep.setpoints[0][0])
+
+    cmu.cv_sweep.sweep_end(3.0)
+
+    cmu.run_sweep()
+    assert cmu.run_sweep.shapes == ((3,),) * 2
+    assert pytest.approx([-1.0, 1.0, 3.0]) == \
+        list(cmu.run_sweep.setpoints[0][0])
+
+    cmu.cv_sweep.sweep_steps(5)
+
+    cmu.run_sweep()
+    assert cmu.run_sweep.shapes == ((5,),) * 2
+    assert pytest.approx([-1.0, 0.0, 1.0, 2.0, 3.0]) == \
+        list(cmu.run_sweep.setpoints[0][0])
+
+
+def test_run_sweep_with_dc_monitor_resets_setpoints(cmu):
+    mainframe = cmu.parent
+
+    cmu.setup_fnc_already_run = True
+    cmu.cv_sweep.sweep_start(-1.0)
+    cmu.cv_sweep.sweep_end(1.0)
+    cmu.cv_sweep.sweep_steps(3)
+
+    response_without_monitor = ','.join(
+        ['NCC+1.00000E-12', 'NCD+2.00000E-03'] * 3)
+    # the AC and DC voltages are monitored along with the measured values
+    response_with_monitor = ','.join(
+        f'NCC+1.00000E-12,NCD+2.00000E-03,NCY+1.00000E-01,NCV{dc_voltage}'
+        for dc_voltage in ('-5.00000E-01', '+0.00000E+00', '+5.00000E-01'))
+
+    mainframe.ask.return_value = response_without_monitor
+    cmu.run_sweep()
+    assert pytest.approx([-1.0, 0.0, 1.0]) == \
+        list(cmu.run_sweep.setpoints[0][0])
+
+    mainframe.ask.return_value = response_with_monitor
+    cmu.run_sweep()
+    assert cmu.run_sweep.shapes == ((3,),) * 2
+    assert pytest.approx([-0.5, 0.0, 0.5]) == \
+        list(cmu.run_sweep.setpoints[0][0])
+
+    # the setpoints of the unchanged sweep must be built again once the
+    # DC voltage is no longer monitored
+    mainframe.ask.return_value = response_without_monitor
+    cmu.run_sweep()
+    assert pytest.approx([-1.0, 0.0, 1.0]) == \
+        list(cmu.run_sweep.setpoints[0][0])
+
+
 
 
 def test_phase_compensation_mode(cmu):
@@ -341,6 +455,15 @@ def test_correction_is_enabled(cmu):
     assert response == constants.CORRST.Response.ON
 
 
+def test_correction_is_enabled_raises_on_unknown_status(cmu):
+    mainframe = cmu.parent
+
+    mainframe.ask.return_value = '7'
+
+    with pytest.raises(ValueError, match="7 is not a valid CORRST"):
+        cmu.correction.is_enabled(constants.CalibrationType.SHORT)
+
+
 def test_correction_set_reference_values(cmu):
     mainframe = cmu.parent
 
@@ -385,6 +508,24 @@ def test_add_frequency_for_correction(cmu):
     mainframe.write.assert_called_once_with('CORRL 3,1000')
 
 
+def test_add_many_frequencies_for_correction(cmu):
+    mainframe = cmu.parent
+
+    cmu.correction.frequency_list.add_many([1000, 2000])
+
+    mainframe.write.assert_called_once_with('CORRL 3,1000;CORRL 3,2000')
+
+    mainframe.reset_mock()
+
+    freqs = [100000 + i for i in range(30)]
+    cmu.correction.frequency_list.add_many(freqs)
+
+    sent = [c[0][0] for c in mainframe.write.call_args_list]
+    assert len(sent) > 1
+    assert all(len(msg) <= MAX_MESSAGE_LENGTH for msg in sent)
+    assert ';'.join(sent) == ';'.join(f'CORRL 3,{f}' for f in freqs)
+
+
 def test_query_from_frequency_list_for_correction(cmu):
     mainframe = cmu.parent
 
@@ -414,6 +555,15 @@ def test_perform_correction(cmu):
     assert constants.CORR.Response.SUCCESSFUL == response
 
 
+def test_perform_correction_raises_on_unknown_status(cmu):
+    mainframe = cmu.parent
+
+    mainframe.ask.return_value = '7'
+
+    with pytest.raises(ValueError, match="7 is not a valid CORR"):
+        cmu.correction.perform(constants.CalibrationType.OPEN)
+
+
 def test_perform_and_enable_correction(cmu):
     mainframe = cmu.parent
 